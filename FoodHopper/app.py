@@ -1,7 +1,13 @@
+import hmac
+import math
 import os
-import uuid
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional
 
 from flask import (
     Flask,
@@ -13,8 +19,12 @@ from flask import (
     jsonify,
     send_from_directory,
     session,
+    g,
 )
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func
+from sqlalchemy.orm import raiseload, selectinload
 from flask_login import (
     LoginManager,
     UserMixin,
@@ -26,15 +36,43 @@ from flask_login import (
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-ALLOWED_IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
+ALLOWED_IMAGE_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif", "webp"})
+
+EARTH_RADIUS_KM = 6371.0
+
+# Uploaded files are written through this pool so a multi-photo submission
+# overlaps its disk writes instead of saving one file at a time.
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="upload-save")
+
+# scrypt is memory-hard and much cheaper to verify than an equivalently
+# strong pbkdf2 iteration count; old pbkdf2 hashes still verify because
+# check_password_hash dispatches on the stored hash prefix.
+PASSWORD_HASH_METHOD = "scrypt:32768:8:1"
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson's C serializer."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
     app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret-change")
     app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
         "DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'foodhopper.db')}"
@@ -42,6 +80,20 @@ def create_app() -> Flask:
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
     app.config["MAX_CONTENT_LENGTH"] = 32 * 1024 * 1024
+    # Hand file bodies off to the front server (X-Sendfile/X-Accel-Redirect)
+    # when one is configured to honor it.
+    app.config["USE_X_SENDFILE"] = os.environ.get("USE_X_SENDFILE") == "1"
+    app.config["UPLOADS_MAX_AGE"] = int(os.environ.get("UPLOADS_MAX_AGE", 86400))
+    # With STRICT_LOADING=1, API queries add raiseload("*") so any
+    # relationship that was not explicitly eager-loaded raises instead of
+    # silently issuing a lazy SELECT.
+    app.config["STRICT_LOADING"] = os.environ.get("STRICT_LOADING") == "1"
+    app.config["ADMIN_USERNAME"] = os.environ.get("ADMIN_USERNAME", "admin")
+    # Only a hash of the admin secret is kept in config; the demo default
+    # remains admin/admin unless ADMIN_PASSWORD_HASH is set.
+    app.config["ADMIN_PASSWORD_HASH"] = os.environ.get(
+        "ADMIN_PASSWORD_HASH", generate_password_hash("admin", method=PASSWORD_HASH_METHOD)
+    )
     return app
 
 
@@ -51,6 +103,21 @@ login_manager = LoginManager(app)
 login_manager.login_view = "login"
 
 
+@lru_cache(maxsize=4096)
+def _isoformat(dt: datetime) -> str:
+    """Memoized isoformat; created_at timestamps never change once written."""
+    return dt.isoformat()
+
+
+def _upload_url(file_name: str) -> str:
+    """url_for for uploads, with the route prefix built once per request."""
+    prefix = getattr(g, "_upload_url_prefix", None)
+    if prefix is None:
+        prefix = url_for("uploaded_file", filename="_")[:-1]
+        g._upload_url_prefix = prefix
+    return prefix + file_name
+
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False)
@@ -59,11 +126,11 @@ class User(UserMixin, db.Model):
     is_vendor = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    places = db.relationship("Place", backref="creator", lazy=True)
-    reviews = db.relationship("Review", backref="author", lazy=True)
+    places = db.relationship("Place", back_populates="creator", lazy="select")
+    reviews = db.relationship("Review", back_populates="author", lazy="select")
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
@@ -84,13 +151,49 @@ class Place(db.Model):
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
 
-    created_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    like_count = db.Column(db.Integer, default=0, nullable=False)
+    favorite_count = db.Column(db.Integer, default=0, nullable=False)
+
+    created_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    photos = db.relationship("PlaceImage", backref="place", cascade="all,delete", lazy=True)
-    reviews = db.relationship("Review", backref="place", cascade="all,delete", lazy=True)
+    creator = db.relationship("User", back_populates="places", lazy="select")
+    photos = db.relationship("PlaceImage", back_populates="place", cascade="all,delete", lazy="select")
+    reviews = db.relationship("Review", back_populates="place", cascade="all,delete", lazy="select")
+    keywords = db.relationship("PlaceKeyword", back_populates="place", cascade="all,delete", lazy="select")
+
+    __table_args__ = (db.Index("ix_place_lat_lon", "latitude", "longitude"),)
+
+    @classmethod
+    def bulk_stats(cls, ids) -> Dict[int, tuple]:
+        """Return {place_id: (avg_rating, review_count)} for the given ids in one query."""
+        if not ids:
+            return {}
+        rows = (
+            db.session.query(Review.place_id, func.avg(Review.rating), func.count())
+            .filter(Review.place_id.in_(ids))
+            .group_by(Review.place_id)
+            .all()
+        )
+        # func.avg yields Decimal on some backends (e.g. Postgres), which
+        # would serialize as a JSON string; coerce so the API stays numeric.
+        return {
+            place_id: (float(avg) if avg is not None else None, count)
+            for place_id, avg, count in rows
+        }
 
-    def to_dict(self, include_reviews: bool = False) -> Dict[str, Any]:
+    def to_dict(
+        self,
+        include_reviews: bool = False,
+        include_photos: bool = True,
+        avg_rating: Optional[float] = None,
+        review_count: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        if review_count is None:
+            review_count = len(self.reviews)
+            avg_rating = (
+                sum([r.rating for r in self.reviews]) / review_count if review_count else None
+            )
         data = {
             "id": self.id,
             "name": self.name,
@@ -105,34 +208,59 @@ class Place(db.Model):
             "latitude": self.latitude,
             "longitude": self.longitude,
             "created_by": self.created_by,
-            "created_at": self.created_at.isoformat(),
-            "photo_urls": [url_for("uploaded_file", filename=img.file_name) for img in self.photos],
-            "avg_rating": round(sum([r.rating for r in self.reviews]) / len(self.reviews), 2) if self.reviews else None,
-            "like_count": Like.query.filter_by(place_id=self.id).count(),
-            "favorite_count": Favorite.query.filter_by(place_id=self.id).count(),
+            "created_at": _isoformat(self.created_at),
+            "avg_rating": round(avg_rating, 2) if avg_rating is not None else None,
+            "review_count": review_count,
+            "like_count": self.like_count,
+            "favorite_count": self.favorite_count,
         }
+        if include_photos:
+            # Touching self.photos triggers a lazy load unless the caller
+            # eager-loaded it; gated so cheap payloads can skip it.
+            data["photo_urls"] = [_upload_url(img.file_name) for img in self.photos]
         if include_reviews:
             data["reviews"] = [r.to_dict() for r in self.reviews]
         return data
 
 
-class PlaceImage(db.Model):
+class PlaceKeyword(db.Model):
+    """One lowercased cuisine/diet token per row, so filters can use indexed equality."""
+
     id = db.Column(db.Integer, primary_key=True)
     place_id = db.Column(db.Integer, db.ForeignKey("place.id"), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # "cuisine" or "diet"
+    keyword = db.Column(db.String(100), nullable=False)
+
+    place = db.relationship("Place", back_populates="keywords", lazy="select")
+
+    __table_args__ = (
+        db.UniqueConstraint("place_id", "kind", "keyword", name="uq_place_keyword"),
+        db.Index("ix_place_keyword_lookup", "kind", "keyword"),
+    )
+
+
+class PlaceImage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    place_id = db.Column(db.Integer, db.ForeignKey("place.id"), nullable=False, index=True)
     file_name = db.Column(db.String(255), nullable=False)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    place = db.relationship("Place", back_populates="photos", lazy="select")
+
 
 class Review(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    place_id = db.Column(db.Integer, db.ForeignKey("place.id"), nullable=False)
+    place_id = db.Column(db.Integer, db.ForeignKey("place.id"), nullable=False, index=True)
     rating = db.Column(db.Integer, nullable=False)
     text = db.Column(db.Text, nullable=True)
     cost = db.Column(db.Integer, nullable=True)
     image_file = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    author = db.relationship("User", back_populates="reviews", lazy="select")
+    place = db.relationship("Place", back_populates="reviews", lazy="select")
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -142,8 +270,8 @@ class Review(db.Model):
             "rating": self.rating,
             "text": self.text,
             "cost": self.cost,
-            "image_url": url_for("uploaded_file", filename=self.image_file) if self.image_file else None,
-            "created_at": self.created_at.isoformat(),
+            "image_url": _upload_url(self.image_file) if self.image_file else None,
+            "created_at": _isoformat(self.created_at),
         }
 
 
@@ -153,7 +281,10 @@ class Favorite(db.Model):
     place_id = db.Column(db.Integer, db.ForeignKey("place.id"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    __table_args__ = (db.UniqueConstraint("user_id", "place_id", name="uq_favorite"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "place_id", name="uq_favorite"),
+        db.Index("ix_favorite_place_id", "place_id"),
+    )
 
 
 class Like(db.Model):
@@ -162,12 +293,82 @@ class Like(db.Model):
     place_id = db.Column(db.Integer, db.ForeignKey("place.id"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    __table_args__ = (db.UniqueConstraint("user_id", "place_id", name="uq_like"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "place_id", name="uq_like"),
+        db.Index("ix_like_place_id", "place_id"),
+    )
+
+
+def _bump_place_counter(connection, place_id: int, column: str, delta: int) -> None:
+    place_table = Place.__table__
+    connection.execute(
+        place_table.update()
+        .where(place_table.c.id == place_id)
+        .values({column: place_table.c[column] + delta})
+    )
+
+
+@event.listens_for(Like, "after_insert")
+def _like_inserted(mapper, connection, target):
+    _bump_place_counter(connection, target.place_id, "like_count", 1)
+
+
+@event.listens_for(Like, "after_delete")
+def _like_deleted(mapper, connection, target):
+    _bump_place_counter(connection, target.place_id, "like_count", -1)
+
+
+@event.listens_for(Favorite, "after_insert")
+def _favorite_inserted(mapper, connection, target):
+    _bump_place_counter(connection, target.place_id, "favorite_count", 1)
+
+
+@event.listens_for(Favorite, "after_delete")
+def _favorite_deleted(mapper, connection, target):
+    _bump_place_counter(connection, target.place_id, "favorite_count", -1)
+
+
+# Flask-Login calls load_user on every authenticated request; a short TTL
+# cache of detached User rows skips that per-request SELECT. Users are
+# immutable after registration, so staleness is bounded by the TTL.
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_MAX_ENTRIES = 1024
+_user_cache: Dict[int, tuple] = {}
+# load_user and logout mutate the cache from concurrent request threads
+# (the dev server runs threaded); the lock keeps the eviction scan from
+# racing inserts/pops.
+_user_cache_lock = threading.Lock()
+
+
+def _user_cache_put(uid: int, user: "User") -> None:
+    now = time.monotonic()
+    with _user_cache_lock:
+        if len(_user_cache) >= USER_CACHE_MAX_ENTRIES:
+            for key in [k for k, (_, expires) in list(_user_cache.items()) if expires <= now]:
+                _user_cache.pop(key, None)
+            # Still full of live entries: evict oldest-inserted (dicts keep
+            # insertion order) so the cache stays bounded.
+            while len(_user_cache) >= USER_CACHE_MAX_ENTRIES:
+                _user_cache.pop(next(iter(_user_cache)))
+        _user_cache[uid] = (user, now + USER_CACHE_TTL_SECONDS)
 
 
 @login_manager.user_loader
 def load_user(user_id: str):
-    return db.session.get(User, int(user_id))
+    uid = int(user_id)
+    cached = _user_cache.get(uid)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+    user = db.session.get(User, uid)
+    if user is not None:
+        # Detach so later commits in this request cannot expire the
+        # cached copy's loaded attributes.
+        db.session.expunge(user)
+        _user_cache_put(uid, user)
+    else:
+        with _user_cache_lock:
+            _user_cache.pop(uid, None)
+    return user
 
 
 @app.route("/")
@@ -180,8 +381,14 @@ def login():
     if request.method == "POST":
         email = request.form.get("email", "").strip()
         password = request.form.get("password", "")
-        # Admin shortcut
-        if email == "admin" and password == "admin":
+        # Admin shortcut (compare as bytes: compare_digest rejects
+        # non-ASCII str input, and emails can contain non-ASCII)
+        admin_username = app.config["ADMIN_USERNAME"]
+        if not isinstance(admin_username, bytes):
+            admin_username = admin_username.encode("utf-8")
+        if hmac.compare_digest(email.encode("utf-8"), admin_username) and check_password_hash(
+            app.config["ADMIN_PASSWORD_HASH"], password
+        ):
             session["is_admin"] = True
             flash("Logged in as admin.", "success")
             return redirect(url_for("admin_dashboard"))
@@ -223,6 +430,8 @@ def register():
 @app.route("/logout")
 @login_required
 def logout():
+    with _user_cache_lock:
+        _user_cache.pop(current_user.id, None)
     logout_user()
     flash("Logged out.", "info")
     return redirect(url_for("index"))
@@ -240,7 +449,14 @@ def vendor_portal():
 
 @app.route("/uploads/<path:filename>")
 def uploaded_file(filename: str):
-    return send_from_directory(app.config["UPLOAD_FOLDER"], filename)
+    # Upload names are content-unique (random suffix), so clients can cache
+    # them and revalidate with If-Modified-Since/ETag for 304s.
+    return send_from_directory(
+        app.config["UPLOAD_FOLDER"],
+        filename,
+        conditional=True,
+        max_age=app.config["UPLOADS_MAX_AGE"],
+    )
 
 
 # ---------- Admin ----------
@@ -252,6 +468,32 @@ def require_admin():
     return True
 
 
+def _remove_upload_files(file_names) -> None:
+    """Unlink known upload names relative to a single opened directory fd."""
+    if not file_names:
+        return
+    folder = app.config["UPLOAD_FOLDER"]
+    if os.unlink in os.supports_dir_fd:
+        try:
+            dir_fd = os.open(folder, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            for name in file_names:
+                try:
+                    os.unlink(name, dir_fd=dir_fd)
+                except OSError:
+                    pass
+        finally:
+            os.close(dir_fd)
+    else:  # e.g. Windows: no dir_fd-relative unlink
+        for name in file_names:
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
+
+
 @app.route("/admin")
 def admin_dashboard():
     if not require_admin():
@@ -279,19 +521,23 @@ def admin_delete_place(place_id: int):
     # Delete associated likes/favorites
     Like.query.filter_by(place_id=place_id).delete()
     Favorite.query.filter_by(place_id=place_id).delete()
-    # Delete place images (files)
-    for img in place.photos:
-        try:
-            os.remove(os.path.join(app.config["UPLOAD_FOLDER"], img.file_name))
-        except Exception:
-            pass
-    # Delete review images (files)
-    for rev in place.reviews:
-        if rev.image_file:
-            try:
-                os.remove(os.path.join(app.config["UPLOAD_FOLDER"], rev.image_file))
-            except Exception:
-                pass
+    # Read just the file-name columns; no need to hydrate the photo and
+    # review collections to delete their files.
+    doomed = {
+        name
+        for (name,) in db.session.query(PlaceImage.file_name).filter_by(place_id=place_id)
+    }
+    doomed.update(
+        name
+        for (name,) in db.session.query(Review.image_file).filter_by(place_id=place_id)
+        if name
+    )
+    _remove_upload_files(doomed)
+    # Bulk-delete child rows so deleting the place does not cascade one
+    # ORM row at a time.
+    PlaceImage.query.filter_by(place_id=place_id).delete()
+    Review.query.filter_by(place_id=place_id).delete()
+    PlaceKeyword.query.filter_by(place_id=place_id).delete()
     db.session.delete(place)
     db.session.commit()
     flash("Place deleted.", "success")
@@ -320,8 +566,46 @@ def admin_delete_review(review_id: int):
 # ---------- API ----------
 
 
+def _strict_load_options() -> list:
+    return [raiseload("*")] if app.config["STRICT_LOADING"] else []
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _tokenize_keywords(raw: Optional[str]) -> list:
+    return [t.strip().lower() for t in (raw or "").split(",") if t.strip()]
+
+
+def _normalize_keyword_string(raw: Optional[str]) -> str:
+    """Canonical stored form: lowercased, deduplicated, sorted, comma-joined."""
+    return ", ".join(sorted(set(_tokenize_keywords(raw))))
+
+
+def _filter_by_keywords(stmt, kind: str, raw: Optional[str]):
+    """Restrict stmt to places carrying every token in raw (comma-separated)."""
+    kws = sorted(set(_tokenize_keywords(raw)))
+    if not kws:
+        return stmt
+    matching_ids = (
+        db.select(PlaceKeyword.place_id)
+        .where(PlaceKeyword.kind == kind, PlaceKeyword.keyword.in_(kws))
+        .group_by(PlaceKeyword.place_id)
+        .having(func.count(func.distinct(PlaceKeyword.keyword)) == len(kws))
+    )
+    return stmt.where(Place.id.in_(matching_ids))
+
+
 def _allowed_file(filename: str) -> bool:
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_IMAGE_EXTENSIONS
+    _, sep, ext = filename.rpartition(".")
+    return bool(sep) and ext.lower() in ALLOWED_IMAGE_EXTENSIONS
 
 
 @app.route("/api/places", methods=["GET"]) 
@@ -330,21 +614,53 @@ def api_list_places():
     diet = request.args.get("diet")
     price_min = request.args.get("price_min", type=int)
     price_max = request.args.get("price_max", type=int)
-
-    q = Place.query
-    if cuisine:
-        for kw in [c.strip().lower() for c in cuisine.split(",") if c.strip()]:
-            q = q.filter(Place.cuisine_types.ilike(f"%{kw}%"))
-    if diet:
-        for dw in [d.strip().lower() for d in diet.split(",") if d.strip()]:
-            q = q.filter(Place.diet_options.ilike(f"%{dw}%"))
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    radius_km = request.args.get("radius_km", type=float)
+    include_photos = request.args.get("include_photos", "1") != "0"
+
+    # Built as a 2.0-style select(): every clause binds its values as
+    # parameters (in_ uses an expanding bindparam), so requests with the
+    # same filter shape reuse the compiled SQL from SQLAlchemy's
+    # statement cache instead of recompiling per request.
+    stmt = db.select(Place)
+    if lat is not None and lng is not None and radius_km is not None and radius_km > 0:
+        # Bounding-box prefilter on the indexed lat/lon columns; exact
+        # great-circle distance is checked below on the survivors.
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        dlng = dlat / max(math.cos(math.radians(lat)), 1e-6)
+        stmt = stmt.where(
+            Place.latitude.between(lat - dlat, lat + dlat),
+            Place.longitude.between(lng - dlng, lng + dlng),
+        )
+    stmt = _filter_by_keywords(stmt, "cuisine", cuisine)
+    stmt = _filter_by_keywords(stmt, "diet", diet)
     if price_min is not None:
-        q = q.filter((Place.price_min == None) | (Place.price_min >= price_min))  # noqa: E711
+        stmt = stmt.where((Place.price_min == None) | (Place.price_min >= price_min))  # noqa: E711
     if price_max is not None:
-        q = q.filter((Place.price_max == None) | (Place.price_max <= price_max))  # noqa: E711
-
-    places = q.order_by(Place.created_at.desc()).all()
-    return jsonify([p.to_dict() for p in places])
+        stmt = stmt.where((Place.price_max == None) | (Place.price_max <= price_max))  # noqa: E711
+
+    if include_photos:
+        stmt = stmt.options(selectinload(Place.photos))
+    stmt = stmt.options(*_strict_load_options())
+    places = db.session.scalars(stmt.order_by(Place.created_at.desc())).all()
+    if lat is not None and lng is not None and radius_km is not None and radius_km > 0:
+        places = [
+            p for p in places if _haversine_km(lat, lng, p.latitude, p.longitude) <= radius_km
+        ]
+
+    stats = Place.bulk_stats([p.id for p in places])
+
+    return jsonify(
+        [
+            p.to_dict(
+                include_photos=include_photos,
+                avg_rating=stats.get(p.id, (None, 0))[0],
+                review_count=stats.get(p.id, (None, 0))[1],
+            )
+            for p in places
+        ]
+    )
 
 
 @app.route("/api/places", methods=["POST"]) 
@@ -363,8 +679,8 @@ def api_create_place():
     place = Place(
         name=name,
         description=data.get("description"),
-        cuisine_types=(data.get("cuisine_types") or "").lower(),
-        diet_options=(data.get("diet_options") or "").lower(),
+        cuisine_types=_normalize_keyword_string(data.get("cuisine_types")),
+        diet_options=_normalize_keyword_string(data.get("diet_options")),
         price_min=(int(data.get("price_min")) if data.get("price_min") else None),
         price_max=(int(data.get("price_max")) if data.get("price_max") else None),
         hours=data.get("hours"),
@@ -377,25 +693,45 @@ def api_create_place():
     db.session.add(place)
     db.session.flush()
 
+    for kind, raw in (("cuisine", place.cuisine_types), ("diet", place.diet_options)):
+        for kw in sorted(set(_tokenize_keywords(raw))):
+            db.session.add(PlaceKeyword(place_id=place.id, kind=kind, keyword=kw))
+
     if "photos" in request.files:
         files = request.files.getlist("photos")
+        save_jobs = []
+        image_rows = []
         for f in files:
             if not f or f.filename == "":
                 continue
             if _allowed_file(f.filename):
                 filename = secure_filename(f.filename)
                 ext = filename.rsplit(".", 1)[1].lower()
-                final_name = f"place_{place.id}_{uuid.uuid4().hex}.{ext}"
-                f.save(os.path.join(app.config["UPLOAD_FOLDER"], final_name))
-                db.session.add(PlaceImage(place_id=place.id, file_name=final_name))
+                final_name = f"place_{place.id}_{secrets.token_hex(8)}.{ext}"
+                dest = os.path.join(app.config["UPLOAD_FOLDER"], final_name)
+                save_jobs.append(_UPLOAD_EXECUTOR.submit(f.save, dest))
+                image_rows.append({"place_id": place.id, "file_name": final_name})
+        # All files must be on disk before the rows referencing them commit.
+        for job in save_jobs:
+            job.result()
+        if image_rows:
+            db.session.execute(db.insert(PlaceImage), image_rows)
 
     db.session.commit()
     return jsonify(place.to_dict(include_reviews=True)), 201
 
 
-@app.route("/api/places/<int:place_id>", methods=["GET"]) 
+@app.route("/api/places/<int:place_id>", methods=["GET"])
 def api_get_place(place_id: int):
-    place = db.session.get(Place, place_id)
+    place = db.session.get(
+        Place,
+        place_id,
+        options=[
+            selectinload(Place.photos),
+            selectinload(Place.reviews).selectinload(Review.author),
+        ]
+        + _strict_load_options(),
+    )
     if not place:
         return jsonify({"error": "Not found"}), 404
     return jsonify(place.to_dict(include_reviews=True))
@@ -424,7 +760,7 @@ def api_add_review(place_id: int):
         if f and _allowed_file(f.filename):
             filename = secure_filename(f.filename)
             ext = filename.rsplit(".", 1)[1].lower()
-            final_name = f"review_{place.id}_{current_user.id}_{uuid.uuid4().hex}.{ext}"
+            final_name = f"review_{place.id}_{current_user.id}_{secrets.token_hex(8)}.{ext}"
             f.save(os.path.join(app.config["UPLOAD_FOLDER"], final_name))
             review.image_file = final_name
 
@@ -439,18 +775,19 @@ def api_favorite(place_id: int):
     place = db.session.get(Place, place_id)
     if not place:
         return jsonify({"error": "Place not found"}), 404
-    action = request.json.get("action") if request.is_json else request.form.get("action")
+    payload = request.get_json(silent=True)
+    action = payload.get("action") if payload else request.form.get("action")
     fav = Favorite.query.filter_by(user_id=current_user.id, place_id=place_id).first()
     if action == "remove":
         if fav:
             db.session.delete(fav)
             db.session.commit()
-        return jsonify({"status": "removed", "favorite_count": Favorite.query.filter_by(place_id=place_id).count()})
+        return jsonify({"status": "removed", "favorite_count": place.favorite_count})
     if not fav:
         fav = Favorite(user_id=current_user.id, place_id=place_id)
         db.session.add(fav)
         db.session.commit()
-    return jsonify({"status": "added", "favorite_count": Favorite.query.filter_by(place_id=place_id).count()})
+    return jsonify({"status": "added", "favorite_count": place.favorite_count})
 
 
 @app.route("/api/places/<int:place_id>/like", methods=["POST"]) 
@@ -463,11 +800,11 @@ def api_like(place_id: int):
     if existing:
         db.session.delete(existing)
         db.session.commit()
-        return jsonify({"status": "unliked", "like_count": Like.query.filter_by(place_id=place_id).count()})
+        return jsonify({"status": "unliked", "like_count": place.like_count})
     like = Like(user_id=current_user.id, place_id=place_id)
     db.session.add(like)
     db.session.commit()
-    return jsonify({"status": "liked", "like_count": Like.query.filter_by(place_id=place_id).count()})
+    return jsonify({"status": "liked", "like_count": place.like_count})
 
 
 @app.context_processor